@@ -5,13 +5,21 @@ Reads text files from source_materials directory and generates .pro6 XML documen
 """
 
 import os
-import uuid
-import xml.etree.ElementTree as ET
+import copy
+import argparse
+from lxml import etree as ET
 from pathlib import Path
-from typing import List, Dict, Tuple, Union, Optional
+from typing import List, Dict, Tuple, Union, Optional, Iterable, Iterator, NamedTuple
 import json
 from dotenv import load_dotenv
 
+# orjson is optional; fall back to the standard library parser
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 # Import from our new modules
 import pp6_xml_elements as xml_elements
 import pp6_color_utils as color_utils
@@ -20,30 +28,228 @@ import pp6_song_parser as song_parser
 # Load environment variables
 load_dotenv()
 
+# Static attributes of the RVPresentationDocument root; per-document values
+# are filled in by PP6Generator._document_attrs (key order is preserved)
+_ROOT_ATTR_TEMPLATE = {
+    'CCLIArtistCredits': '',
+    'CCLIAuthor': '',
+    'CCLICopyrightYear': '',
+    'CCLIDisplay': 'false',
+    'CCLIPublisher': '',
+    'CCLISongNumber': '',
+    'CCLISongTitle': '',
+    'backgroundColor': '',
+    'buildNumber': '',
+    'category': 'Presentation',
+    'chordChartPath': '',
+    'docType': '0',
+    'drawingBackgroundColor': 'false',
+    'height': '',
+    'lastDateUsed': '',
+    'notes': '',
+    'os': '2',
+    'resourcesDirectory': '',
+    'selectedArrangementID': '',
+    'usedCount': '0',
+    'uuid': '',
+    'versionNumber': '',
+    'width': ''
+}
+
+# Static attributes of RVDisplaySlide, filled in per slide by create_json_slide
+_SLIDE_ATTR_TEMPLATE = {
+    'UUID': '',
+    'backgroundColor': '',
+    'chordChartPath': '',
+    'drawingBackgroundColor': '',
+    'enabled': 'true',
+    'highlightColor': '1 1 1 0',
+    'hotKey': '',
+    'label': '',
+    'notes': '',
+    'socialItemCount': ''
+}
+
+_TIMELINE_ATTRS = {
+    'duration': '0.000000',
+    'loop': 'false',
+    'playBackRate': '0.000000',
+    'rvXMLIvarName': 'timeline',
+    'selectedMediaTrackIndex': '0',
+    'timeOffset': '0.000000'
+}
+
+# Shared attributes of the named <array> containers; ET copies attributes into
+# each node, so one constant dict per container name can be reused everywhere
+_TIME_CUES_ATTRS = {'rvXMLIvarName': 'timeCues'}
+_MEDIA_TRACKS_ATTRS = {'rvXMLIvarName': 'mediaTracks'}
+_GROUPS_ATTRS = {'rvXMLIvarName': 'groups'}
+_SLIDES_ATTRS = {'rvXMLIvarName': 'slides'}
+_ARRANGEMENTS_ATTRS = {'rvXMLIvarName': 'arrangements'}
+_GROUP_IDS_ATTRS = {'rvXMLIvarName': 'groupIDs'}
+_CUES_ATTRS = {'rvXMLIvarName': 'cues'}
+_DISPLAY_ELEMENTS_ATTRS = {'rvXMLIvarName': 'displayElements'}
+
+
+def _build_timeline(**overrides) -> ET.Element:
+    """Build an empty RVTimeline with its timeCues and mediaTracks arrays"""
+    timeline = ET.Element('RVTimeline', {**_TIMELINE_ATTRS, **overrides})
+    ET.SubElement(timeline, 'array', _TIME_CUES_ATTRS)
+    ET.SubElement(timeline, 'array', _MEDIA_TRACKS_ATTRS)
+    return timeline
+
+
+# Timelines are constant per document type; each document gets a deep copy
+_TIMELINE_PROTO = _build_timeline()
+_SONG_TIMELINE_PROTO = _build_timeline(playBackRate='1.000000')
+_JSON_TIMELINE_PROTO = _build_timeline(playBackRate='1.000000', selectedMediaTrackIndex='-1')
+
+# File kinds recognised when scanning a source directory, keyed by extension;
+# matching is case-sensitive, like the file patterns in pptx_generator
+_SOURCE_FILE_KINDS = {
+    '.png': 'image',
+    '.jpg': 'image',
+    '.jpeg': 'image',
+    '.mp4': 'video',
+    '.json': 'json'
+}
+
+# Preference order when several media files share a base name
+_MEDIA_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.mp4')
+
+# Font names for the fontFamily values a JSON slide config may use
+_FONT_FAMILY_NAMES = {
+    'arial': 'Arial',
+    'helvetica': 'Helvetica',
+}
+
+# Output files are written through a large buffer so multi-megabyte documents
+# reach the disk in a few write calls
+_WRITE_BUFFER_SIZE = 1 << 20
+
+
+def _path_stem(path: str) -> str:
+    """Return the file name of path without its extension"""
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def _scan_source_directory(source_path: Union[str, Path]) -> Tuple[List[str], List[str], List[str]]:
+    """Collect image, video and JSON files from a directory in a single pass
+    
+    Returns (image_files, video_files, json_files) as path strings, each sorted by file name.
+    """
+    image_files, video_files, json_files = [], [], []
+    buckets = {'image': image_files, 'video': video_files, 'json': json_files}
+    
+    with os.scandir(source_path) as entries:
+        for entry in entries:
+            if not entry.is_file():
+                continue
+            kind = _SOURCE_FILE_KINDS.get(os.path.splitext(entry.name)[1])
+            if kind:
+                buckets[kind].append(entry.path)
+    
+    for files in buckets.values():
+        files.sort(key=os.path.basename)
+    return image_files, video_files, json_files
+
+
+def _read_json_file(path: str) -> dict:
+    """Load a JSON slide configuration file"""
+    with open(path, 'rb') as f:
+        return _json_loads(f.read())
+
+
+class SlideConfig(NamedTuple):
+    """Settings for a single slide built by PP6Generator.create_json_slide"""
+    text: str = ''
+    background: Optional[str] = None
+    label: str = ''
+    position: Optional[str] = None
+    font_size: int = 59
+    font_bold: bool = False
+    font_name: str = 'PingFangSC-Regular'
+    simple_format: bool = True
+    vertical_alignment: str = '0'
+    background_color: str = '0 0 0 1'
+    color: str = '#000000'
+    countdown_message: bool = False
+    clear_props: bool = False
+    # Set when background is known to exist, so create_json_slide can skip the stat
+    background_verified: bool = False
+
+
+# Optional slide cues in output order: the SlideConfig flag enabling each cue
+# and a builder that takes the generator's UUID factory
+_SLIDE_CUE_BUILDERS = (
+    ('countdown_message', lambda gen_uuid: xml_elements.create_message_cue(gen_uuid(), gen_uuid())),
+    ('clear_props', lambda gen_uuid: xml_elements.create_clear_cue(gen_uuid())),
+)
+
+# Number of UUIDs generated per os.urandom call
+_UUID_POOL_SIZE = 256
+
 
 class PP6Generator:
     def __init__(self, width=1024, height=768):
         self.width = width
         self.height = height
+        # Dimensions are written as attributes on every document
+        self._width_str = str(width)
+        self._height_str = str(height)
         self.build_number = "100991749"
         self.version_number = "600"
+        # Default lines per song slide, read once rather than per song
+        self._default_lines_per_slide = int(os.getenv('PAGE_BREAK_EVERY', '2'))
+        # Hex digits of pre-generated random bytes consumed by generate_uuid
+        self._uuid_pool = ''
+        self._uuid_pool_pos = 0
         
     def generate_uuid(self) -> str:
         """Generate a valid UUID4 in uppercase format"""
-        return str(uuid.uuid4()).upper()
+        # Format random bytes directly instead of going through uuid.UUID,
+        # drawing them from a pool refilled _UUID_POOL_SIZE UUIDs at a time
+        pos = self._uuid_pool_pos
+        if pos >= len(self._uuid_pool):
+            self._uuid_pool = os.urandom(16 * _UUID_POOL_SIZE).hex().upper()
+            pos = 0
+        self._uuid_pool_pos = pos + 32
+        h = self._uuid_pool[pos:pos + 32]
+        return f"{h[0:8]}-{h[8:12]}-4{h[13:16]}-{'89AB'[int(h[16], 16) & 3]}{h[17:20]}-{h[20:32]}"
     
-    def format_xml(self, elem: ET.Element) -> str:
-        """Convert ElementTree to XML string without declaration"""
-        # Convert to string without pretty printing to match sample format
-        xml_string = ET.tostring(elem, encoding='unicode')
-        return xml_string
+    def format_xml(self, elem: ET.Element) -> bytes:
+        """Convert ElementTree to UTF-8 encoded XML without declaration"""
+        # Convert to bytes without pretty printing to match sample format
+        xml_bytes = ET.tostring(elem, encoding='utf-8', xml_declaration=False)
+        return xml_bytes
     
-    def create_slide(self, text: str = None, background_image: str = None, label: str = "") -> Tuple[ET.Element, str]:
+    def write_xml(self, elem: ET.Element, output_file: Union[str, Path]):
+        """Serialize elem straight to output_file, in the same format as format_xml"""
+        with open(output_file, 'wb', buffering=_WRITE_BUFFER_SIZE) as f:
+            ET.ElementTree(elem).write(f, encoding='utf-8', xml_declaration=False)
+    
+    def _document_attrs(self, title: str, doc_uuid: str, **overrides) -> Dict[str, str]:
+        """Build the RVPresentationDocument root attributes from the shared template"""
+        attrs = _ROOT_ATTR_TEMPLATE.copy()
+        attrs.update(
+            CCLISongTitle=title,
+            buildNumber=self.build_number,
+            height=self._height_str,
+            uuid=doc_uuid,
+            versionNumber=self.version_number,
+            width=self._width_str
+        )
+        attrs.update(overrides)
+        return attrs
+    
+    def create_slide(self, text: str = None, background_image: str = None, label: str = "",
+                     background_verified: bool = False) -> Tuple[ET.Element, str]:
         """Create a slide with optional text content and background image"""
         slide_uuid = self.generate_uuid()
         slide = xml_elements.create_slide(
             slide_uuid, text, background_image, label, 
-            element_uuid_gen=self.generate_uuid, width=self.width
+            element_uuid_gen=self.generate_uuid, width=self.width,
+            background_verified=background_verified
         )
         return slide, slide_uuid
     
@@ -56,49 +262,23 @@ class PP6Generator:
                 - str: text content for slide
                 - Tuple[Optional[str], Optional[str], str]: (text, background_image_path, label)
         """
+        root, slides_array = self._create_document_shell(title)
+        slides_array.extend(self._iter_document_slides(slides_data))
+        
+        return root
+    
+    def _create_document_shell(self, title: str) -> Tuple[ET.Element, ET.Element]:
+        """Create the skeleton of a regular document, returning the root and its empty slides array"""
         doc_uuid = self.generate_uuid()
         
         # Root element - matching sample order and attributes
-        root = ET.Element('RVPresentationDocument', {
-            'CCLIArtistCredits': '',
-            'CCLIAuthor': '',
-            'CCLICopyrightYear': '',
-            'CCLIDisplay': 'false',
-            'CCLIPublisher': '',
-            'CCLISongNumber': '',
-            'CCLISongTitle': title,
-            'backgroundColor': '',
-            'buildNumber': self.build_number,
-            'category': 'Presentation',
-            'chordChartPath': '',
-            'docType': '0',
-            'drawingBackgroundColor': 'false',
-            'height': str(self.height),
-            'lastDateUsed': '',
-            'notes': '',
-            'os': '2',
-            'resourcesDirectory': '',
-            'selectedArrangementID': '',
-            'usedCount': '0',
-            'uuid': doc_uuid,
-            'versionNumber': self.version_number,
-            'width': str(self.width)
-        })
+        root = ET.Element('RVPresentationDocument', self._document_attrs(title, doc_uuid))
         
         # Timeline
-        timeline = ET.SubElement(root, 'RVTimeline', {
-            'duration': '0.000000',
-            'loop': 'false',
-            'playBackRate': '0.000000',
-            'rvXMLIvarName': 'timeline',
-            'selectedMediaTrackIndex': '0',
-            'timeOffset': '0.000000'
-        })
-        ET.SubElement(timeline, 'array', {'rvXMLIvarName': 'timeCues'})
-        ET.SubElement(timeline, 'array', {'rvXMLIvarName': 'mediaTracks'})
+        root.append(copy.deepcopy(_TIMELINE_PROTO))
         
         # Groups array
-        groups_array = ET.SubElement(root, 'array', {'rvXMLIvarName': 'groups'})
+        groups_array = ET.SubElement(root, 'array', _GROUPS_ATTRS)
         
         # Create a single group for all slides
         group_uuid = self.generate_uuid()
@@ -108,10 +288,17 @@ class PP6Generator:
             'uuid': group_uuid
         })
         
-        slides_array = ET.SubElement(group, 'array', {'rvXMLIvarName': 'slides'})
+        slides_array = ET.SubElement(group, 'array', _SLIDES_ATTRS)
+        
+        # Arrangements array (empty like in sample)
+        arrangements_array = ET.SubElement(root, 'array', _ARRANGEMENTS_ATTRS)
         
-        # Add slides
-        for i, slide_info in enumerate(slides_data):
+        return root, slides_array
+    
+    def _iter_document_slides(self, slides_data: Iterable[Union[str, Tuple[Optional[str], Optional[str], str]]],
+                              background_verified: bool = False) -> Iterator[ET.Element]:
+        """Yield a slide element for each entry of create_document's slides_data"""
+        for slide_info in slides_data:
             if isinstance(slide_info, tuple):
                 text, bg_image, label = slide_info
             else:
@@ -119,13 +306,46 @@ class PP6Generator:
                 bg_image = None
                 label = ""
             
-            slide, slide_uuid = self.create_slide(text, bg_image, label)
-            slides_array.append(slide)
-        
-        # Arrangements array (empty like in sample)
-        arrangements_array = ET.SubElement(root, 'array', {'rvXMLIvarName': 'arrangements'})
+            slide, slide_uuid = self.create_slide(text, bg_image, label,
+                                                  background_verified=background_verified)
+            yield slide
+    
+    def write_document(self, output_file: str, root: ET.Element, slides_array: ET.Element,
+                       slides: Iterable[ET.Element]):
+        """Stream a document to disk, writing slides into slides_array as they are produced
+        
+        Only the document skeleton stays in memory; each slide is serialized
+        and released before the next one is built. The document goes to a
+        temporary file that replaces output_file only once every slide has
+        been written, so a failing slide leaves no partial document behind.
+        """
+        ancestors = set(slides_array.iterancestors())
+        
+        def write_element(xf, elem):
+            if elem is slides_array:
+                with xf.element(elem.tag, dict(elem.attrib)):
+                    for slide in slides:
+                        xf.write(slide)
+            elif elem in ancestors:
+                with xf.element(elem.tag, dict(elem.attrib)):
+                    for child in elem:
+                        write_element(xf, child)
+            else:
+                xf.write(elem)
         
-        return root
+        temp_file = f"{os.fspath(output_file)}.tmp"
+        try:
+            with open(temp_file, 'wb', buffering=_WRITE_BUFFER_SIZE) as f, \
+                    ET.xmlfile(f, encoding='utf-8') as xf:
+                write_element(xf, root)
+        except BaseException:
+            # Slides are built lazily, so an error can surface mid-document
+            try:
+                os.remove(temp_file)
+            except OSError:
+                pass
+            raise
+        os.replace(temp_file, output_file)
     
     def create_song_document(self, title: str, song_file_path: str, lines_per_slide: int = None) -> ET.Element:
         """Create a ProPresenter 6 song document with arrangement support
@@ -137,21 +357,16 @@ class PP6Generator:
         """
         # Get lines per slide from environment or use default
         if lines_per_slide is None:
-            lines_per_slide = int(os.getenv('PAGE_BREAK_EVERY', '2'))
+            lines_per_slide = self._default_lines_per_slide
+        # Values below 1 put each line on its own slide
+        lines_per_slide = max(1, lines_per_slide)
         
         # Check for media files in the same directory
         song_dir = Path(song_file_path).parent
-        media_files = []
-        
-        # Collect all image files
-        for ext in ['.png', '.jpg', '.jpeg']:
-            media_files.extend(song_dir.glob(f'*{ext}'))
-        
-        # Collect all video files
-        media_files.extend(song_dir.glob('*.mp4'))
+        image_files, video_files, _ = _scan_source_directory(song_dir)
         
         # Sort media files by name
-        media_files.sort(key=lambda x: x.name)
+        media_files = sorted(image_files + video_files, key=os.path.basename)
         
         # Parse the song file
         sections, arrangement = song_parser.parse_song_file(song_file_path)
@@ -162,59 +377,31 @@ class PP6Generator:
         doc_uuid = self.generate_uuid()
         
         # Root element
-        root = ET.Element('RVPresentationDocument', {
-            'CCLIArtistCredits': '',
-            'CCLIAuthor': '',
-            'CCLICopyrightYear': '',
-            'CCLIDisplay': 'false',
-            'CCLIPublisher': '',
-            'CCLISongNumber': '',
-            'CCLISongTitle': title,
-            'backgroundColor': '0 0 0 0',
-            'buildNumber': self.build_number,
-            'category': 'Presentation',
-            'chordChartPath': '',
-            'docType': '0',
-            'drawingBackgroundColor': 'false',
-            'height': str(self.height),
-            'lastDateUsed': '2025-06-07T16:09:41-07:00',
-            'notes': '',
-            'os': '2',
-            'resourcesDirectory': '',
-            'selectedArrangementID': '',
-            'usedCount': '0',
-            'uuid': doc_uuid,
-            'versionNumber': self.version_number,
-            'width': str(self.width)
-        })
+        root = ET.Element('RVPresentationDocument', self._document_attrs(
+            title, doc_uuid, backgroundColor='0 0 0 0', lastDateUsed='2025-06-07T16:09:41-07:00'
+        ))
         
         # Timeline
-        timeline = ET.SubElement(root, 'RVTimeline', {
-            'duration': '0.000000',
-            'loop': 'false',
-            'playBackRate': '1.000000',
-            'rvXMLIvarName': 'timeline',
-            'selectedMediaTrackIndex': '0',
-            'timeOffset': '0.000000'
-        })
-        ET.SubElement(timeline, 'array', {'rvXMLIvarName': 'timeCues'})
-        ET.SubElement(timeline, 'array', {'rvXMLIvarName': 'mediaTracks'})
+        root.append(copy.deepcopy(_SONG_TIMELINE_PROTO))
         
         # Groups array
-        groups_array = ET.SubElement(root, 'array', {'rvXMLIvarName': 'groups'})
+        groups_array = ET.SubElement(root, 'array', _GROUPS_ATTRS)
         
-        # Create unique sections (not duplicates from arrangement)
-        unique_sections = []
-        seen = set()
-        for section in sections.keys():
-            if section not in seen:
-                unique_sections.append(section)
-                seen.add(section)
+        # Create unique sections (not duplicates from arrangement); dict keys are
+        # already unique and in file order
+        unique_sections = list(sections)
         
         # Track group UUIDs for arrangement
         section_to_group_uuid = {}
         media_group_uuid = None  # Track media group UUID separately
         
+        # Bind the callables used per section and per slide to locals
+        sub_element = ET.SubElement
+        gen_uuid = self.generate_uuid
+        create_slide = self.create_slide
+        get_display_name = color_utils.get_section_display_name
+        get_color = color_utils.get_section_color
+        
         # Create a group for each unique section
         for section_name in unique_sections:
             section_lines = sections[section_name]
@@ -223,40 +410,32 @@ class PP6Generator:
             if not any(line.strip() for line in section_lines):
                 continue
             
-            group_uuid = self.generate_uuid()
+            group_uuid = gen_uuid()
             section_to_group_uuid[section_name] = group_uuid
-            display_name = color_utils.get_section_display_name(section_name)
-            color = color_utils.get_section_color(section_name)
+            display_name = get_display_name(section_name)
+            color = get_color(section_name)
             
-            group = ET.SubElement(groups_array, 'RVSlideGrouping', {
+            group = sub_element(groups_array, 'RVSlideGrouping', {
                 'color': color,
                 'name': display_name,
                 'uuid': group_uuid
             })
             
-            slides_array = ET.SubElement(group, 'array', {'rvXMLIvarName': 'slides'})
-            
-            # Split section content into slides
-            slide_texts = []
-            current_slide_lines = []
-            
-            for line in section_lines:
-                current_slide_lines.append(line.rstrip())  # Remove trailing whitespace but keep blank lines
-                
-                # Break slide when we reach the target number of total lines (including blank lines)
-                if len(current_slide_lines) >= lines_per_slide:
-                    slide_texts.append('\n'.join(current_slide_lines))
-                    current_slide_lines = []
+            slides_array = sub_element(group, 'array', _SLIDES_ATTRS)
             
-            # Add remaining lines as last slide
-            if current_slide_lines:
-                slide_texts.append('\n'.join(current_slide_lines))
+            # Split section content into slides of lines_per_slide lines (including blank
+            # lines), removing trailing whitespace; the last slide takes the remainder
+            stripped_lines = [line.rstrip() for line in section_lines]
+            slide_texts = ['\n'.join(stripped_lines[i:i + lines_per_slide])
+                           for i in range(0, len(stripped_lines), lines_per_slide)]
             
             # Create slides for this section
-            for i, slide_text in enumerate(slide_texts):
-                slide_label = f"{section_name}-{i+1}" if len(slide_texts) > 1 else ""
-                slide, slide_uuid = self.create_slide(slide_text, None, slide_label)
-                slides_array.append(slide)
+            if len(slide_texts) > 1:
+                slide_labels = [f"{section_name}-{i+1}" for i in range(len(slide_texts))]
+            else:
+                slide_labels = [""]
+            slides_array.extend([create_slide(slide_text, None, slide_label)[0]
+                                 for slide_text, slide_label in zip(slide_texts, slide_labels)])
         
         # Add media files as separate slides if found
         if media_files:
@@ -267,16 +446,15 @@ class PP6Generator:
                 'uuid': media_group_uuid
             })
             
-            media_slides_array = ET.SubElement(media_group, 'array', {'rvXMLIvarName': 'slides'})
+            media_slides_array = ET.SubElement(media_group, 'array', _SLIDES_ATTRS)
             
             # Create a slide for each media file
-            for media_file in media_files:
-                media_label = media_file.stem
-                media_slide, media_slide_uuid = self.create_slide(None, str(media_file), media_label)
-                media_slides_array.append(media_slide)
+            media_slides_array.extend([create_slide(None, media_file, _path_stem(media_file),
+                                                    background_verified=True)[0]
+                                       for media_file in media_files])
         
         # Arrangements array
-        arrangements_array = ET.SubElement(root, 'array', {'rvXMLIvarName': 'arrangements'})
+        arrangements_array = ET.SubElement(root, 'array', _ARRANGEMENTS_ATTRS)
         
         # Create arrangement based on the song file
         if arrangement:
@@ -288,65 +466,60 @@ class PP6Generator:
             })
             
             # Add group IDs array
-            group_ids_array = ET.SubElement(song_arrangement, 'array', {'rvXMLIvarName': 'groupIDs'})
+            group_ids_array = ET.SubElement(song_arrangement, 'array', _GROUP_IDS_ATTRS)
             
             # Add media group at the beginning if it exists
-            if media_group_uuid:
-                ns_string = ET.SubElement(group_ids_array, 'NSString')
-                ns_string.text = media_group_uuid
+            group_ids = [media_group_uuid] if media_group_uuid else []
             
             # Add group IDs in arrangement order
-            for section in arrangement:
-                if section in section_to_group_uuid:
-                    ns_string = ET.SubElement(group_ids_array, 'NSString')
-                    ns_string.text = section_to_group_uuid[section]
+            group_ids.extend(section_to_group_uuid[section] for section in arrangement
+                             if section in section_to_group_uuid)
+            group_ids_array.extend([xml_elements.create_ns_string(group_id) for group_id in group_ids])
             
             # Set the selected arrangement ID in root
             root.set('selectedArrangementID', arrangement_uuid)
         
         return root
     
-    def generate_from_directory(self, source_dir: str, output_file: str):
-        """Generate PP6 document from directory using unified JSON/media processing rules"""
+    def generate_from_directory(self, source_dir: str, output_file: str, verbose: bool = True):
+        """Generate PP6 document from directory using unified JSON/media processing rules
+        
+        Pass verbose=False to suppress the summary printed after writing, e.g.
+        when generating many documents in a batch.
+        """
         source_path = Path(source_dir)
         
         if not source_path.exists():
             raise ValueError(f"Source directory {source_dir} does not exist")
         
-        # Check if directory has JSON files
-        json_files = list(source_path.glob('*.json'))
+        # Scan once and hand the listing to whichever processor handles it
+        scan = _scan_source_directory(source_path)
         
-        if json_files:
+        # Check if directory has JSON files
+        if scan[2]:
             # Use unified JSON/media processing
-            self.generate_from_unified_directory(source_dir, output_file)
+            self.generate_from_unified_directory(source_dir, output_file, verbose, _scan=scan)
         else:
             # Legacy processing for directories without JSON
-            self._generate_from_legacy_directory(source_dir, output_file)
+            self._generate_from_legacy_directory(source_dir, output_file, verbose, _scan=scan)
     
-    def _generate_from_legacy_directory(self, source_dir: str, output_file: str):
+    def _generate_from_legacy_directory(self, source_dir: str, output_file: str, verbose: bool = True,
+                                        _scan: Optional[Tuple[List[str], List[str], List[str]]] = None):
         """Legacy processing for directories without JSON files"""
         source_path = Path(source_dir)
         
         # Collect media files only (no text files in legacy mode)
-        image_files = []
-        video_files = []
-        
-        # Collect image files
-        for ext in ['*.png', '*.jpg', '*.jpeg']:
-            image_files.extend(source_path.glob(ext))
-        
-        # Collect video files
-        video_files = list(source_path.glob('*.mp4'))
+        image_files, video_files, _ = _scan or _scan_source_directory(source_path)
         
         # Combine all media files
         media_files = image_files + video_files
-        media_files.sort(key=lambda x: x.name)
+        media_files.sort(key=os.path.basename)
         
         # Create slides for media files
         slides_data = []
         for media_file in media_files:
-            label = media_file.stem
-            slides_data.append((None, str(media_file), label))
+            label = _path_stem(media_file)
+            slides_data.append((None, media_file, label))
         
         if not slides_data:
             raise ValueError(f"No media files found in {source_dir}")
@@ -354,64 +527,50 @@ class PP6Generator:
         # Generate title from directory name
         title = source_path.name.replace('_', ' ').title()
         
-        # Create document
-        doc = self.create_document(title, slides_data)
-        
-        # Write to file
-        xml_content = self.format_xml(doc)
-        
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(xml_content)
+        # Create document skeleton and stream the slides to file; the media
+        # paths come from the directory scan, so they are known to exist
+        root, slides_array = self._create_document_shell(title)
+        self.write_document(output_file, root, slides_array,
+                            self._iter_document_slides(slides_data, background_verified=True))
         
-        print(f"Generated {output_file} with {len(slides_data)} slides from {source_dir}")
-        print(f"  - {len(image_files)} image files")
-        print(f"  - {len(video_files)} video files")
+        if verbose:
+            print(f"Generated {output_file} with {len(slides_data)} slides from {source_dir}")
+            print(f"  - {len(image_files)} image files")
+            print(f"  - {len(video_files)} video files")
     
-    def generate_from_unified_directory(self, source_dir: str, output_file: str):
+    def generate_from_unified_directory(self, source_dir: str, output_file: str, verbose: bool = True,
+                                       _scan: Optional[Tuple[List[str], List[str], List[str]]] = None):
         """Generate PP6 document using unified JSON/media processing rules"""
         source_path = Path(source_dir)
         
-        # Collect all files
-        json_files = sorted(source_path.glob('*.json'), key=lambda x: x.name)
-        image_files = []
-        video_files = []
-        
-        # Collect image files
-        for ext in ['*.png', '*.jpg', '*.jpeg']:
-            image_files.extend(source_path.glob(ext))
-        
-        # Collect video files
-        video_files.extend(source_path.glob('*.mp4'))
+        # Collect all files, reusing the caller's scan when given
+        image_files, video_files, json_files = _scan or _scan_source_directory(source_path)
         
         # Combine all media files
-        all_media_files = sorted(image_files + video_files, key=lambda x: x.name)
+        all_media_files = sorted(image_files + video_files, key=os.path.basename)
+        
+        # Index the scanned files by base name so matching needs no extra stat calls
+        json_by_stem = {_path_stem(f): f for f in json_files}
+        media_by_stem = {}
+        for f in sorted(all_media_files, key=lambda x: _MEDIA_EXTENSIONS.index(os.path.splitext(x)[1])):
+            media_by_stem.setdefault(_path_stem(f), f)
         
         # Create a set of all unique base names
-        all_base_names = set()
-        for f in json_files:
-            all_base_names.add(f.stem)
-        for f in all_media_files:
-            all_base_names.add(f.stem)
+        all_base_names = json_by_stem.keys() | media_by_stem.keys()
+        
+        # Load every JSON configuration up front
+        config_by_stem = {stem: _read_json_file(path) for stem, path in json_by_stem.items()}
         
         # Process each unique base name
         slides_data = []
         for base_name in sorted(all_base_names):
-            # Check for JSON file
-            json_file = source_path / f"{base_name}.json"
-            has_json = json_file.exists()
-            
-            # Check for media file
-            media_file = None
-            for ext in ['.png', '.jpg', '.jpeg', '.mp4']:
-                potential_media = source_path / f"{base_name}{ext}"
-                if potential_media.exists():
-                    media_file = str(potential_media)
-                    break
+            # Check for JSON and media files
+            has_json = base_name in config_by_stem
+            media_file = media_by_stem.get(base_name)
             
             if has_json:
-                # Load JSON configuration
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
+                # JSON configuration for this slide
+                config = config_by_stem[base_name]
                 
                 # Extract configuration
                 text = config.get('text', '')
@@ -439,11 +598,7 @@ class PP6Generator:
                 font_name = config.get('fontName', 'PingFangSC-Regular')
                 
                 # Map font families
-                font_family = config.get('fontFamily', '').lower()
-                if font_family == 'arial':
-                    font_name = 'Arial'
-                elif font_family == 'helvetica':
-                    font_name = 'Helvetica'
+                font_name = _FONT_FAMILY_NAMES.get(config.get('fontFamily', '').lower(), font_name)
                 
                 simple_format = config.get('simpleFormat', True)
                 vertical_alignment = config.get('verticalAlignment', '0')
@@ -452,38 +607,28 @@ class PP6Generator:
                 text_color = config.get('color', '#000000')
                 
                 # Create slide data
-                slide_info = {
-                    'text': text,
-                    'background': media_file,  # Can be None
-                    'label': label,
-                    'position': position,
-                    'font_size': font_size,
-                    'font_bold': font_bold,
-                    'font_name': font_name,
-                    'simple_format': simple_format,
-                    'vertical_alignment': vertical_alignment,
-                    'background_color': background_color,
-                    'color': text_color,
-                    'countdown_message': config.get('countdown_message', False),
-                    'clear_props': config.get('clear_props', False)
-                }
+                slide_info = SlideConfig(
+                    text=text,
+                    background=media_file,  # Can be None
+                    label=label,
+                    position=position,
+                    font_size=font_size,
+                    font_bold=font_bold,
+                    font_name=font_name,
+                    simple_format=simple_format,
+                    vertical_alignment=vertical_alignment,
+                    background_color=background_color,
+                    color=text_color,
+                    countdown_message=config.get('countdown_message', False),
+                    clear_props=config.get('clear_props', False),
+                    background_verified=True  # Found by the directory scan or checked above
+                )
                 slides_data.append(slide_info)
             else:
                 # No JSON - image only slide
                 if media_file:
-                    slide_info = {
-                        'text': '',
-                        'background': media_file,
-                        'label': base_name,
-                        'position': None,
-                        'font_size': 59,
-                        'font_bold': False,
-                        'font_name': 'PingFangSC-Regular',
-                        'simple_format': True,
-                        'vertical_alignment': '0',
-                        'background_color': '0 0 0 1'
-                    }
-                    slides_data.append(slide_info)
+                    slides_data.append(SlideConfig(background=media_file, label=base_name,
+                                                   background_verified=True))
         
         if not slides_data:
             raise ValueError(f"No content files found in {source_dir}")
@@ -491,68 +636,41 @@ class PP6Generator:
         # Generate title from directory name
         title = source_path.name.replace('_', ' ').replace('-', ' ').title()
         
-        # Create document with unified slides
-        doc = self.create_json_document(title, slides_data)
+        # Create document skeleton and stream the unified slides to file
+        root, slides_array = self._create_json_document_shell(title)
+        slides = (self.create_json_slide(slide_config)[0] for slide_config in slides_data)
+        self.write_document(output_file, root, slides_array, slides)
         
-        # Write to file
-        xml_content = self.format_xml(doc)
-        
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(xml_content)
-        
-        print(f"Generated {output_file} with {len(slides_data)} slides from {source_dir}")
-        print(f"  - {len(json_files)} JSON configuration files")
-        print(f"  - {len(all_media_files)} media files")
+        if verbose:
+            print(f"Generated {output_file} with {len(slides_data)} slides from {source_dir}")
+            print(f"  - {len(json_files)} JSON configuration files")
+            print(f"  - {len(all_media_files)} media files")
     
-    def generate_from_json_directory(self, source_dir: str, output_file: str):
+    def generate_from_json_directory(self, source_dir: str, output_file: str, verbose: bool = True):
         """Redirect to unified directory processing"""
-        self.generate_from_unified_directory(source_dir, output_file)
+        self.generate_from_unified_directory(source_dir, output_file, verbose)
     
-    def create_json_document(self, title: str, slides_data: List[Dict]) -> ET.Element:
+    def create_json_document(self, title: str, slides_data: List[SlideConfig]) -> ET.Element:
         """Create a ProPresenter 6 document from JSON-configured slides"""
+        root, slides_array = self._create_json_document_shell(title)
+        
+        # Add slides with JSON configuration
+        slides_array.extend([self.create_json_slide(slide_config)[0] for slide_config in slides_data])
+        
+        return root
+    
+    def _create_json_document_shell(self, title: str) -> Tuple[ET.Element, ET.Element]:
+        """Create the skeleton of a JSON-configured document, returning the root and its empty slides array"""
         doc_uuid = self.generate_uuid()
         
         # Root element
-        root = ET.Element('RVPresentationDocument', {
-            'CCLIArtistCredits': '',
-            'CCLIAuthor': '',
-            'CCLICopyrightYear': '',
-            'CCLIDisplay': 'false',
-            'CCLIPublisher': '',
-            'CCLISongNumber': '',
-            'CCLISongTitle': title,
-            'backgroundColor': '0 0 0 0',
-            'buildNumber': self.build_number,
-            'category': 'Presentation',
-            'chordChartPath': '',
-            'docType': '0',
-            'drawingBackgroundColor': 'false',
-            'height': str(self.height),
-            'lastDateUsed': '',
-            'notes': '',
-            'os': '2',
-            'resourcesDirectory': '',
-            'selectedArrangementID': '',
-            'usedCount': '0',
-            'uuid': doc_uuid,
-            'versionNumber': self.version_number,
-            'width': str(self.width)
-        })
+        root = ET.Element('RVPresentationDocument', self._document_attrs(title, doc_uuid, backgroundColor='0 0 0 0'))
         
         # Timeline
-        timeline = ET.SubElement(root, 'RVTimeline', {
-            'duration': '0.000000',
-            'loop': 'false',
-            'playBackRate': '1.000000',
-            'rvXMLIvarName': 'timeline',
-            'selectedMediaTrackIndex': '-1',
-            'timeOffset': '0.000000'
-        })
-        ET.SubElement(timeline, 'array', {'rvXMLIvarName': 'timeCues'})
-        ET.SubElement(timeline, 'array', {'rvXMLIvarName': 'mediaTracks'})
+        root.append(copy.deepcopy(_JSON_TIMELINE_PROTO))
         
         # Groups array
-        groups_array = ET.SubElement(root, 'array', {'rvXMLIvarName': 'groups'})
+        groups_array = ET.SubElement(root, 'array', _GROUPS_ATTRS)
         
         # Create a single group for all slides
         group_uuid = self.generate_uuid()
@@ -562,67 +680,57 @@ class PP6Generator:
             'uuid': group_uuid
         })
         
-        slides_array = ET.SubElement(group, 'array', {'rvXMLIvarName': 'slides'})
-        
-        # Add slides with JSON configuration
-        for slide_config in slides_data:
-            slide, slide_uuid = self.create_json_slide(slide_config)
-            slides_array.append(slide)
+        slides_array = ET.SubElement(group, 'array', _SLIDES_ATTRS)
         
         # Arrangements array (empty)
-        ET.SubElement(root, 'array', {'rvXMLIvarName': 'arrangements'})
+        ET.SubElement(root, 'array', _ARRANGEMENTS_ATTRS)
         
-        return root
+        return root, slides_array
     
-    def create_json_slide(self, config: Dict) -> Tuple[ET.Element, str]:
+    def create_json_slide(self, config: SlideConfig) -> Tuple[ET.Element, str]:
         """Create a slide from JSON configuration"""
-        slide_uuid = self.generate_uuid()
-        
-        background_color = config.get('background_color', '0 0 0 1')
-        slide = ET.Element('RVDisplaySlide', {
-            'UUID': slide_uuid,
-            'backgroundColor': background_color,
-            'chordChartPath': '',
-            'drawingBackgroundColor': 'true' if background_color != '0 0 0 1' else 'false',
-            'enabled': 'true',
-            'highlightColor': '1 1 1 0',
-            'hotKey': '',
-            'label': config.get('label', ''),
-            'notes': '',
-            'socialItemCount': '1' if config.get('text') else '0'
-        })
-        
+        gen_uuid = self.generate_uuid
+        slide_uuid = gen_uuid()
+        
+        text = config.text
+        background = config.background
+        background_color = config.background_color
+        attrs = _SLIDE_ATTR_TEMPLATE.copy()
+        attrs['UUID'] = slide_uuid
+        attrs['backgroundColor'] = background_color
+        attrs['drawingBackgroundColor'] = 'true' if background_color != '0 0 0 1' else 'false'
+        attrs['label'] = config.label
+        attrs['socialItemCount'] = '1' if text else '0'
+        slide = ET.Element('RVDisplaySlide', attrs)
+        
+        # Children are appended in document order: cues, background, display elements
         # Cues array - add cues based on config
-        cues_array = ET.SubElement(slide, 'array', {'rvXMLIvarName': 'cues'})
-        if config.get('countdown_message', False):
-            message_cue = xml_elements.create_message_cue(self.generate_uuid(), self.generate_uuid())
-            cues_array.append(message_cue)
-        if config.get('clear_props', False):
-            clear_cue = xml_elements.create_clear_cue(self.generate_uuid())
-            cues_array.append(clear_cue)
+        cues_array = ET.SubElement(slide, 'array', _CUES_ATTRS)
+        cues_array.extend([build_cue(gen_uuid) for flag, build_cue in _SLIDE_CUE_BUILDERS
+                           if getattr(config, flag)])
         
         # Add background media if provided
-        if config.get('background') and os.path.exists(config['background']):
+        if background and (config.background_verified or os.path.exists(background)):
             bg_cue = xml_elements.create_background_media_cue(
-                config['background'], self.generate_uuid(), self.generate_uuid()
+                background, gen_uuid(), gen_uuid()
             )
-            slide.insert(1, bg_cue)  # Insert after cues array
+            slide.append(bg_cue)
         
         # Display elements array with text
-        display_elements = ET.SubElement(slide, 'array', {'rvXMLIvarName': 'displayElements'})
+        display_elements = ET.SubElement(slide, 'array', _DISPLAY_ELEMENTS_ATTRS)
         
-        if config.get('text'):
+        if text:
             text_element = xml_elements.create_text_element(
-                text=config['text'],
+                text=text,
                 slide_uuid=slide_uuid,
-                element_uuid=self.generate_uuid(),
-                position=config.get('position'),
-                font_size=config.get('font_size', 59),
-                font_bold=config.get('font_bold', False),
-                font_name=config.get('font_name', 'PingFangSC-Regular'),
-                simple_format=config.get('simple_format', True),
-                vertical_alignment=config.get('vertical_alignment', '0'),
-                text_color=config.get('color', '#000000'),
+                element_uuid=gen_uuid(),
+                position=config.position,
+                font_size=config.font_size,
+                font_bold=config.font_bold,
+                font_name=config.font_name,
+                simple_format=config.simple_format,
+                vertical_alignment=config.vertical_alignment,
+                text_color=config.color,
                 default_width=self.width
             )
             display_elements.append(text_element)
@@ -632,8 +740,6 @@ class PP6Generator:
 
 def main():
     """Main function to run the generator"""
-    import argparse
-    
     parser = argparse.ArgumentParser(description='Generate ProPresenter 6 documents')
     parser.add_argument('--type', choices=['document', 'song'], default='document',
                        help='Type of PP6 document to generate')
@@ -659,10 +765,7 @@ def main():
         
         try:
             doc = generator.create_song_document(title, args.source, args.lines_per_slide)
-            xml_content = generator.format_xml(doc)
-            
-            with open(args.output, 'w', encoding='utf-8') as f:
-                f.write(xml_content)
+            generator.write_xml(doc, args.output)
             
             print(f"Generated song document: {args.output}")
             
@@ -6,7 +6,7 @@ Generates PP6 playlist directories with proper structure and data.pro6pl file
 
 import os
 import shutil
-import xml.etree.ElementTree as ET
+from lxml import etree as ET
 import uuid
 from urllib.parse import quote, unquote
 from pathlib import Path
@@ -14,7 +14,10 @@ import platform
 import argparse
 import zipfile
 import tempfile
+import multiprocessing
+from operator import attrgetter
 from typing import List, Dict, Tuple
+from concurrent.futures import ProcessPoolExecutor
 from dotenv import load_dotenv
 from generate_pp6_doc import PP6Generator  # Import existing document generator
 
@@ -32,6 +35,51 @@ def is_song_file(filepath: str) -> bool:
         return False
 
 
+def _generate_source_document(subdir: str, output_file: str, verbose: bool = True) -> List[str]:
+    """Generate one document from a source_materials subdirectory
+    
+    Returns the progress messages for the caller to print, so documents
+    built in worker processes are still reported in order; verbose=False
+    also silences the generator's own summary.
+    """
+    subdir = Path(subdir)
+    doc_generator = PP6Generator()
+    messages = []
+    
+    # Check if this directory contains a song file
+    txt_files = list(subdir.glob('*.txt'))
+    is_song_dir = False
+    song_file = None
+    
+    for txt_file in txt_files:
+        if is_song_file(str(txt_file)):
+            is_song_dir = True
+            song_file = txt_file
+            break
+    
+    if is_song_dir and song_file:
+        # Generate as a song document
+        title = song_file.stem.replace('_', ' ').title()
+        messages.append(f"Detected song file: {song_file.name}")
+        doc = doc_generator.create_song_document(title, str(song_file))
+        doc_generator.write_xml(doc, output_file)
+        
+        messages.append(f"Generated song: {output_file}")
+    else:
+        # Check if directory has JSON files
+        json_files = list(subdir.glob('*.json'))
+        if json_files:
+            # Generate from JSON configurations
+            doc_generator.generate_from_json_directory(str(subdir), str(output_file), verbose)
+            messages.append(f"Generated document from JSON: {output_file}")
+        else:
+            # Generate as regular document
+            doc_generator.generate_from_directory(str(subdir), str(output_file), verbose)
+            messages.append(f"Generated document: {output_file}")
+    
+    return messages
+
+
 class PP6PlaylistGenerator:
     """Generator for ProPresenter 6 playlist directories"""
     
@@ -416,6 +464,8 @@ def main():
                        help='Only create .pro6plx file in current directory, use temp for all other files')
     parser.add_argument('--generate-docs', action='store_true', 
                        help='Generate sample documents from source_materials')
+    parser.add_argument('--jobs', type=int, default=1,
+                       help='Worker processes used to generate sample documents (default: 1)')
     parser.add_argument('documents', nargs='*', help='PP6 documents to include')
     
     args = parser.parse_args()
@@ -441,7 +491,6 @@ def main():
     # If --generate-docs flag is set, generate documents first
     if args.generate_docs:
         print("Generating sample documents...")
-        doc_generator = PP6Generator()
         
         # Generate documents from source_materials subdirectories
         source_dir = Path("source_materials")
@@ -449,48 +498,33 @@ def main():
         
         if source_dir.exists():
             # Sort subdirectories to ensure consistent ordering
-            subdirs = sorted([d for d in source_dir.iterdir() if d.is_dir()], key=lambda x: x.name)
+            subdirs = sorted([d for d in source_dir.iterdir() if d.is_dir()], key=attrgetter('name'))
+            output_files = []
             for subdir in subdirs:
-                    if doc_temp_dir:
-                        output_file = Path(doc_temp_dir) / f"generated_{subdir.name}.pro6"
-                    else:
-                        output_file = f"generated_{subdir.name}.pro6"
-                    
-                    # Check if this directory contains a song file
-                    txt_files = list(subdir.glob('*.txt'))
-                    is_song_dir = False
-                    song_file = None
-                    
-                    for txt_file in txt_files:
-                        if is_song_file(str(txt_file)):
-                            is_song_dir = True
-                            song_file = txt_file
-                            break
-                    
-                    if is_song_dir and song_file:
-                        # Generate as a song document
-                        title = song_file.stem.replace('_', ' ').title()
-                        print(f"Detected song file: {song_file.name}")
-                        doc = doc_generator.create_song_document(title, str(song_file))
-                        xml_content = doc_generator.format_xml(doc)
-                        
-                        with open(output_file, 'w', encoding='utf-8') as f:
-                            f.write(xml_content)
-                        
-                        print(f"Generated song: {output_file}")
-                    else:
-                        # Check if directory has JSON files
-                        json_files = list(subdir.glob('*.json'))
-                        if json_files:
-                            # Generate from JSON configurations
-                            doc_generator.generate_from_json_directory(str(subdir), str(output_file))
-                            print(f"Generated document from JSON: {output_file}")
-                        else:
-                            # Generate as regular document
-                            doc_generator.generate_from_directory(str(subdir), str(output_file))
-                            print(f"Generated document: {output_file}")
-                    
-                    generated_docs.append(str(output_file))
+                if doc_temp_dir:
+                    output_file = Path(doc_temp_dir) / f"generated_{subdir.name}.pro6"
+                else:
+                    output_file = f"generated_{subdir.name}.pro6"
+                output_files.append(str(output_file))
+            
+            # Documents are independent, so --jobs can spread them over worker
+            # processes; results come back in subdirectory order. Daemonic
+            # processes (e.g. Celery prefork workers) cannot start a pool.
+            workers = min(args.jobs, len(subdirs))
+            if workers < 2 or multiprocessing.current_process().daemon:
+                for subdir, output_file in zip(subdirs, output_files):
+                    for message in _generate_source_document(str(subdir), output_file):
+                        print(message)
+            else:
+                # Workers skip the per-document summaries, which would interleave
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    results = executor.map(_generate_source_document, map(str, subdirs), output_files,
+                                           [False] * len(subdirs))
+                    for messages in results:
+                        for message in messages:
+                            print(message)
+            
+            generated_docs.extend(output_files)
         
         # Add generated documents to playlist
         for doc in generated_docs:
@@ -191,9 +191,7 @@ class UnifiedPresentationGenerator:
                 title = kwargs.get('title', output_base)
                 lines_per_slide = kwargs.get('lines_per_slide', None)
                 doc = generator.create_song_document(title, str(song_file), lines_per_slide)
-                xml_content = generator.format_xml(doc)
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    f.write(xml_content)
+                generator.write_xml(doc, output_file)
                 print(f"Generated song document: {output_file}")
             else:
                 # Generate regular document
@@ -4,6 +4,7 @@ Handles color conversions and section color management
 """
 
 import re
+from functools import lru_cache
 from typing import Dict
 
 
@@ -20,7 +21,14 @@ SECTION_COLORS = {
     'default': '0.2637968361377716 0.2637968361377716 0.2637968361377716 1'  # Dark gray
 }
 
+# Section colors in priority order for substring matching in get_section_color
+_SECTION_COLOR_ITEMS = tuple(SECTION_COLORS.items())
 
+# Section number in names such as "V2" or "Chorus 3"
+_DIGIT_RE = re.compile(r'\d+')
+
+
+@lru_cache(maxsize=256)
 def convert_color_to_rgba(color: str) -> str:
     """Convert color from hex or name to PP6 RGBA format"""
     if color.startswith('#'):
@@ -45,28 +53,27 @@ def convert_color_to_rgba(color: str) -> str:
         return "0 0 0 1"
 
 
+@lru_cache(maxsize=64)
 def get_section_color(section_name: str) -> str:
     """Get color for a section based on its type with graduated colors for verses and choruses"""
     section_lower = section_name.lower()
     
     # Try to determine section type from name
-    for key in SECTION_COLORS:
+    for key, color in _SECTION_COLOR_ITEMS:
         if key in section_lower:
-            return SECTION_COLORS[key]
+            return color
     
     # Check common abbreviations with graduated colors
+    # Extract number from verse or chorus (V1, C2, etc.)
+    number_match = _DIGIT_RE.search(section_name)
     if section_lower.startswith('v'):
-        # Extract number from verse (V1, V2, V3, etc.)
-        number_match = re.search(r'(\d+)', section_name)
         if number_match:
-            verse_num = int(number_match.group(1))
+            verse_num = int(number_match.group())
             return _get_graduated_verse_color(verse_num)
         return SECTION_COLORS['verse']
     elif section_lower.startswith('c') and not section_lower.startswith('co'):
-        # Extract number from chorus (C1, C2, C3, etc.)
-        number_match = re.search(r'(\d+)', section_name)
         if number_match:
-            chorus_num = int(number_match.group(1))
+            chorus_num = int(number_match.group())
             return _get_graduated_chorus_color(chorus_num)
         return SECTION_COLORS['chorus']
     elif section_lower.startswith('b'):
@@ -85,6 +92,7 @@ def get_section_color(section_name: str) -> str:
     return SECTION_COLORS['default']
 
 
+@lru_cache(maxsize=32)
 def _get_graduated_verse_color(verse_num: int) -> str:
     """Get graduated blue color for verses (V1 = blue, V2 = lighter blue, V3 = even lighter blue)"""
     # Base verse color: '0 0 0.9981992244720459 1' (blue)
@@ -105,6 +113,7 @@ def _get_graduated_verse_color(verse_num: int) -> str:
         return f'{lightness} {lightness} {blue_intensity} 1'
 
 
+@lru_cache(maxsize=32)
 def _get_graduated_chorus_color(chorus_num: int) -> str:
     """Get graduated red color for choruses (C1 = red, C2 = lighter red, C3 = even lighter red)"""
     # Base chorus color: '0.9859541654586792 0 0.02694005146622658 1' (red)
@@ -135,51 +144,34 @@ def _get_graduated_chorus_color(chorus_num: int) -> str:
         return f'{graduated_red} {graduated_green} {graduated_blue} 1'
 
 
+@lru_cache(maxsize=64)
 def get_section_display_name(section_name: str) -> str:
     """Get display name for a section"""
     # Map common abbreviations to full names
     section_lower = section_name.lower()
     
     if section_lower.startswith('v'):
-        number = re.search(r'\d+', section_name)
-        if number:
-            return f"Verse {number.group()}"
-        return "Verse"
+        display_name = "Verse"
     elif section_lower.startswith('co'):
         # Handle "coda" before checking for "chorus"
-        number = re.search(r'\d+', section_name)
-        if number:
-            return f"Coda {number.group()}"
-        return "Coda"
+        display_name = "Coda"
     elif section_lower.startswith('c') and not section_lower.startswith('ch'):
-        number = re.search(r'\d+', section_name)
-        if number:
-            return f"Chorus {number.group()}"
-        return "Chorus"
+        display_name = "Chorus"
     elif section_lower.startswith('b'):
-        number = re.search(r'\d+', section_name)
-        if number:
-            return f"Bridge {number.group()}"
-        return "Bridge"
+        display_name = "Bridge"
     elif section_lower.startswith('pc'):
-        number = re.search(r'\d+', section_name)
-        if number:
-            return f"Pre-Chorus {number.group()}"
-        return "Pre-Chorus"
+        display_name = "Pre-Chorus"
     elif section_lower.startswith('t'):
-        number = re.search(r'\d+', section_name)
-        if number:
-            return f"Tag {number.group()}"
-        return "Tag"
+        display_name = "Tag"
     elif section_lower.startswith('i'):
-        number = re.search(r'\d+', section_name)
-        if number:
-            return f"Intro {number.group()}"
-        return "Intro"
+        display_name = "Intro"
     elif section_lower.startswith('o'):
-        number = re.search(r'\d+', section_name)
-        if number:
-            return f"Outro {number.group()}"
-        return "Outro"
+        display_name = "Outro"
+    else:
+        return section_name
     
-    return section_name
\ No newline at end of file
+    # Append the section number (V1, C2, etc.) once for whichever type matched
+    number = _DIGIT_RE.search(section_name)
+    if number:
+        return f"{display_name} {number.group()}"
+    return display_name
@@ -3,31 +3,39 @@ ProPresenter 6 Song Parser Module
 Handles parsing of song files with sections and arrangements
 """
 
+import re
 from typing import Dict, List, Tuple
 
 
+# First line whose stripped text starts with "Arrangement"
+_ARRANGEMENT_LINE_RE = re.compile(r'^[^\S\n]*Arrangement', re.MULTILINE)
+
+
 def parse_song_file(filepath: str) -> Tuple[Dict[str, List[str]], List[str]]:
     """Parse song file to extract sections and arrangement"""
     with open(filepath, 'r', encoding='utf-8') as f:
-        lines = f.read().strip().split('\n')
+        content = f.read().strip()
+    lines = content.split('\n')
     
-    # First pass: find arrangement line to get valid section names
+    # Find the arrangement line in the raw text to get valid section names,
+    # so the lines are only walked once below
     arrangement = []
     arrangement_line_index = -1
-    for i, line in enumerate(lines):
-        if line.strip().startswith('Arrangement'):
-            arrangement_line_index = i
-            if i + 1 < len(lines):
-                arrangement = lines[i + 1].strip().split()
-            break
+    match = _ARRANGEMENT_LINE_RE.search(content)
+    if match:
+        arrangement_line_index = content.count('\n', 0, match.start())
+        if arrangement_line_index + 1 < len(lines):
+            arrangement = lines[arrangement_line_index + 1].strip().split()
     
-    # Extract unique section names from arrangement (case insensitive)
-    valid_sections = set(arrangement)
+    # Map lowercased arrangement names to their spellings (case insensitive)
+    valid_sections = {}
+    for arr_section in arrangement:
+        valid_sections.setdefault(arr_section.lower(), []).append(arr_section)
     
     # Create case-insensitive mapping from arrangement to actual section headers
     arrangement_to_section = {}
     
-    # Second pass: parse sections and build case-insensitive mapping
+    # Parse sections and build case-insensitive mapping
     sections = {}
     current_section = None
     
@@ -35,31 +43,24 @@ def parse_song_file(filepath: str) -> Tuple[Dict[str, List[str]], List[str]]:
         # Skip the arrangement line and the line after it
         if i == arrangement_line_index or i == arrangement_line_index + 1:
             continue
-            
+        
         line_stripped = line.strip()
         
         # Check if this line matches any arrangement section (case insensitive)
-        matched_arrangement = None
-        for arr_section in valid_sections:
-            if line_stripped.lower() == arr_section.lower():
-                matched_arrangement = arr_section
-                break
+        matched_arrangement = valid_sections.get(line_stripped.lower())
         
         if matched_arrangement:
             current_section = line_stripped  # Use the actual section header as found
             sections[current_section] = []
-            # Map arrangement name to actual section header
-            arrangement_to_section[matched_arrangement] = line_stripped
+            # Map arrangement names to actual section header
+            for arr_section in matched_arrangement:
+                arrangement_to_section[arr_section] = line_stripped
         elif current_section:
             # Add line to current section (including blank lines)
             sections[current_section].append(line)
     
     # Update arrangement to use actual section headers
-    updated_arrangement = []
-    for arr_section in arrangement:
-        if arr_section in arrangement_to_section:
-            updated_arrangement.append(arrangement_to_section[arr_section])
-        else:
-            updated_arrangement.append(arr_section)  # Keep original if no mapping found
+    updated_arrangement = [arrangement_to_section.get(arr_section, arr_section)
+                           for arr_section in arrangement]
     
-    return sections, updated_arrangement
\ No newline at end of file
+    return sections, updated_arrangement
@@ -3,34 +3,255 @@ ProPresenter 6 XML Element Creation Module
 Handles creation of various XML elements for PP6 documents
 """
 
-import base64
 import os
-import xml.etree.ElementTree as ET
-from pathlib import Path
+import re
+import copy
+from functools import lru_cache
+from lxml import etree as ET
 from typing import Tuple, Optional, Dict
 
+# pybase64 (SIMD-accelerated) is optional; fall back to the standard library
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
+
+_b64encode = base64.b64encode
+
+# RTF documents produced by encode_text, pre-encoded as bytes templates; only
+# the font, color, size and escaped text are filled in per call
+_RTF_SIMPLE_PREFIX = rb"""{\rtf1\ansi\ansicpg1252\cocoartf2822
+\cocoatextscaling0\cocoaplatform0{\fonttbl\f0\fnil\fcharset134 %s;\f1\fswiss\fcharset0 Helvetica;}
+{\colortbl;\red%d\green%d\blue%d;}
+{\*\expandedcolortbl;;}
+\deftab720
+\pard\pardeftab720\partightenfactor0
+
+\f0%s\fs%s \cf1 """
+_RTF_SIMPLE_SUFFIX = rb"""
+\f1  }"""
+
+_RTF_OUTLINE_PREFIX = rb"""{\rtf1\ansi\ansicpg1252\cocoartf2822
+\cocoatextscaling0\cocoaplatform0{\fonttbl\f0\fnil\fcharset134 %s;}
+{\colortbl;\red255\green255\blue255;\red255\green255\blue255;\red0\green0\blue0;}
+{\*\expandedcolortbl;;\csgray\c100000;\cssrgb\c0\c0\c0;}
+\pard\pardirnatural\qc\partightenfactor0
+
+\f0%s\fs%s \cf2 \kerning1\expnd8\expndtw40
+\outl0\strokewidth-40 \strokec3 """
+_RTF_OUTLINE_SUFFIX = rb"""
+}"""
+
+# Constant attributes of the elements built below; per-element values are
+# set on a copy or clone of each template (key order is preserved)
+_TEXT_ELEMENT_ATTRS = {
+    'UUID': '',
+    'additionalLineFillHeight': '0.000000',
+    'adjustsHeightToFit': 'false',
+    'bezelRadius': '0.000000',
+    'displayDelay': '0.000000',
+    'displayName': 'TextElement',
+    'drawLineBackground': 'false',
+    'drawingFill': 'false',
+    'drawingShadow': 'false',
+    'drawingStroke': 'false',
+    'fillColor': '1 1 1 1',
+    'fromTemplate': 'false',
+    'lineBackgroundType': '0',
+    'lineFillVerticalOffset': '0.000000',
+    'locked': 'false',
+    'opacity': '1.000000',
+    'persistent': 'false',
+    'revealType': '0',
+    'rotation': '0.000000',
+    'source': '',
+    'textSourceRemoveLineReturnsOption': 'false',
+    'typeID': '0',
+    'useAllCaps': 'false',
+    'verticalAlignment': ''
+}
+
+_MEDIA_CUE_ATTRS = {
+    'UUID': '',
+    'actionType': '0',
+    'alignment': '4',
+    'behavior': '2',  # 2 for both images and videos
+    'dateAdded': '',
+    'delayTime': '0.000000',
+    'displayName': '',
+    'enabled': 'true',
+    'nextCueUUID': '00000000-0000-0000-0000-000000000000',
+    'rvXMLIvarName': 'backgroundMediaCue',
+    'tags': '',
+    'timeStamp': '0.000000'
+}
+
+_VIDEO_ELEMENT_ATTRS = {
+    'UUID': '',
+    'audioVolume': '1.000000',
+    'bezelRadius': '0.000000',
+    'displayDelay': '0.000000',
+    'displayName': 'VideoElement',
+    'drawingFill': 'false',
+    'drawingShadow': 'false',
+    'drawingStroke': 'false',
+    'endPoint': '30030',  # Default endpoint
+    'fieldType': '0',
+    'fillColor': '0 0 0 0',
+    'flippedHorizontally': 'false',
+    'flippedVertically': 'false',
+    'format': "'avc1'",
+    'frameRate': '29.970030',
+    'fromTemplate': 'false',
+    'imageOffset': '{0, 0}',
+    'inPoint': '0',
+    'locked': 'false',
+    'manufactureName': '',
+    'manufactureURL': '',
+    'naturalSize': '{1920, 1080}',  # Default HD size
+    'opacity': '1.000000',
+    'outPoint': '30030',
+    'persistent': 'false',
+    'playRate': '1.000000',
+    'playbackBehavior': '1',
+    'rotation': '0.000000',
+    'rvXMLIvarName': 'element',
+    'scaleBehavior': '0',
+    'scaleSize': '{1, 1}',
+    'source': '',
+    'timeScale': '1000',
+    'typeID': '0'
+}
+
+_IMAGE_ELEMENT_ATTRS = {
+    'UUID': '',
+    'bezelRadius': '0.000000',
+    'displayDelay': '0.000000',
+    'displayName': 'ImageElement',
+    'drawingFill': 'false',
+    'drawingShadow': 'false',
+    'drawingStroke': 'false',
+    'fillColor': '0 0 0 0',
+    'flippedHorizontally': 'false',
+    'flippedVertically': 'false',
+    'format': '',
+    'fromTemplate': 'false',
+    'imageOffset': '{0, 0}',
+    'locked': 'false',
+    'manufactureName': '',
+    'manufactureURL': '',
+    'opacity': '1.000000',
+    'persistent': 'false',
+    'rotation': '0.000000',
+    'rvXMLIvarName': 'element',
+    'scaleBehavior': '0',
+    'scaleSize': '{1, 1}',
+    'source': '',
+    'typeID': '0'
+}
+
+_SLIDE_ATTRS = {
+    'UUID': '',
+    'backgroundColor': '0 0 0 1',
+    'chordChartPath': '',
+    'drawingBackgroundColor': 'false',
+    'enabled': 'true',
+    'highlightColor': '1 1 1 0',
+    'hotKey': '',
+    'label': '',
+    'notes': '',
+    'socialItemCount': ''
+}
+
+# Shadow and stroke subtrees are identical on every element of a kind, so they
+# are parsed once and deep-copied into each element
+_TEXT_SHADOW_PROTO = ET.fromstring(
+    '<shadow rvXMLIvarName="shadow">0.000000|0 0 0 0.3294117748737335|{4, -4}</shadow>'
+)
+_TEXT_STROKE_PROTO = ET.fromstring(
+    '<dictionary rvXMLIvarName="stroke">'
+    '<NSColor rvXMLDictionaryKey="RVShapeElementStrokeColorKey">0 0 0 1</NSColor>'
+    '<NSNumber hint="double" rvXMLDictionaryKey="RVShapeElementStrokeWidthKey">0.000000</NSNumber>'
+    '</dictionary>'
+)
+_MEDIA_SHADOW_PROTO = ET.fromstring(
+    '<shadow rvXMLIvarName="shadow">0.000000|0 0 0 0.3333333432674408|{4, -4}</shadow>'
+)
+_MEDIA_STROKE_PROTO = ET.fromstring(
+    '<dictionary rvXMLIvarName="stroke">'
+    '<NSColor rvXMLDictionaryKey="RVShapeElementStrokeColorKey">0 0 0 1</NSColor>'
+    '<NSNumber hint="float" rvXMLDictionaryKey="RVShapeElementStrokeWidthKey">1.000000</NSNumber>'
+    '</dictionary>'
+)
+
+
+# Runs of non-ASCII characters in slide text, and the RTF escape for each byte
+# of their GB2312 encoding
+_NON_ASCII_RUN_RE = re.compile(r'[^\x00-\x7f]+')
+_GB2312_BYTE_ESCAPES = ["\\'%02x" % b for b in range(256)]
+
+# Texts longer than this bypass the encode_text cache to bound its memory
+_ENCODE_TEXT_CACHE_MAX_LEN = 4096
+
 
 def encode_text(text: str, font_size: int = 114, font_bold: bool = True, 
                 font_name: str = "PingFangSC-Semibold", simple_format: bool = False,
                 text_color: str = "#000000") -> str:
     """Encode text in RTF format matching ProPresenter 6 Mac format"""
-    # Convert text to RTF with proper encoding for Chinese characters
-    rtf_text = ""
-    for char in text:
-        if char == '\n':
-            rtf_text += '\\\n'
-        elif ord(char) > 127:
-            # Try to encode as GB2312 (Chinese encoding)
-            try:
-                gb_bytes = char.encode('gb2312')
-                rtf_text += ''.join([f"\\'{b:02x}" for b in gb_bytes])
-            except:
-                # If not in GB2312, use Unicode encoding
-                code = ord(char)
-                rtf_text += f"\\u{code}?"
-        else:
-            rtf_text += char
+    # Repeated lines (choruses, refrains) reuse the cached encoding
+    if len(text) > _ENCODE_TEXT_CACHE_MAX_LEN:
+        return _encode_rtf(text, font_size, font_bold, font_name, simple_format, text_color)
+    return _encode_rtf_cached(text, font_size, font_bold, font_name, simple_format, text_color)
+
+
+def _encode_rtf(text: str, font_size: int, font_bold: bool, font_name: str,
+                simple_format: bool, text_color: str) -> str:
+    """Build the base64-encoded RTF document for text"""
+    # Convert text to RTF with proper encoding for Chinese characters;
+    # line breaks are the only ASCII character needing an escape
+    rtf_text = text.replace('\n', '\\\n')
+    if not rtf_text.isascii():
+        rtf_text = _NON_ASCII_RUN_RE.sub(_escape_non_ascii_run, rtf_text)
     
+    # After escaping the body is pure ASCII, so encode it as such
+    head, tail = _rtf_head_tail(font_size, font_bold, font_name, simple_format, text_color)
+    rtf_b64 = _b64encode(b''.join((head, rtf_text.encode('ascii'), tail))).decode('ascii')
+    return rtf_b64
+
+
+# Typed like _rtf_head_tail, so 59 and 59.0 font sizes keep separate encodings
+_encode_rtf_cached = lru_cache(maxsize=2048, typed=True)(_encode_rtf)
+
+
+def _escape_non_ascii_run(match: re.Match) -> str:
+    """Escape a run of non-ASCII characters as RTF GB2312 byte escapes"""
+    run = match.group()
+    # Encode the whole run as GB2312 (Chinese encoding) in one call; characters
+    # outside GB2312 come back as b'?', which never occurs in a double-byte code
+    gb_bytes = run.encode('gb2312', errors='replace')
+    if b'?' not in gb_bytes:
+        return ''.join([_GB2312_BYTE_ESCAPES[b] for b in gb_bytes])
+    
+    # Walk the run alongside its bytes, using Unicode escapes for the replaced characters
+    parts = []
+    pos = 0
+    for char in run:
+        if gb_bytes[pos] == 0x3f:
+            # If not in GB2312, use Unicode encoding
+            parts.append(f"\\u{ord(char)}?")
+            pos += 1
+        else:
+            parts.append(_GB2312_BYTE_ESCAPES[gb_bytes[pos]])
+            parts.append(_GB2312_BYTE_ESCAPES[gb_bytes[pos + 1]])
+            pos += 2
+    return ''.join(parts)
+
+
+# typed=True: font_size is rendered with str(), so 59 and 59.0 must not share an entry
+@lru_cache(maxsize=64, typed=True)
+def _rtf_head_tail(font_size: int, font_bold: bool, font_name: str,
+                   simple_format: bool, text_color: str) -> Tuple[bytes, bytes]:
+    """Return the RTF bytes before and after the slide text for one text style"""
     # Parse text color
     if text_color.startswith('#'):
         hex_color = text_color.lstrip('#')
@@ -41,30 +262,40 @@ def encode_text(text: str, font_size: int = 114, font_bold: bool = True,
         # Default to black
         r, g, b = 0, 0, 0
     
+    font_name_bytes = font_name.encode('utf-8')
+    bold = b"\\b" if font_bold else b""
+    size = str(font_size).encode('ascii')
     if simple_format:
         # Simple format with custom text color
-        rtf_template = r"""{\rtf1\ansi\ansicpg1252\cocoartf2822
-\cocoatextscaling0\cocoaplatform0{\fonttbl\f0\fnil\fcharset134 """ + font_name + r""";\f1\fswiss\fcharset0 Helvetica;}
-{\colortbl;\red""" + str(r) + r"""\green""" + str(g) + r"""\blue""" + str(b) + r""";}
-{\*\expandedcolortbl;;}
-\deftab720
-\pard\pardeftab720\partightenfactor0
-
-\f0""" + (r"\b" if font_bold else "") + r"\fs" + str(font_size) + r" \cf1 " + rtf_text + r"""
-\f1  }"""
+        prefix = _RTF_SIMPLE_PREFIX % (font_name_bytes, r, g, b, bold, size)
+        suffix = _RTF_SIMPLE_SUFFIX
     else:
         # Original format with outlines
-        rtf_template = r"""{\rtf1\ansi\ansicpg1252\cocoartf2822
-\cocoatextscaling0\cocoaplatform0{\fonttbl\f0\fnil\fcharset134 """ + font_name + r""";}
-{\colortbl;\red255\green255\blue255;\red255\green255\blue255;\red0\green0\blue0;}
-{\*\expandedcolortbl;;\csgray\c100000;\cssrgb\c0\c0\c0;}
-\pard\pardirnatural\qc\partightenfactor0
+        prefix = _RTF_OUTLINE_PREFIX % (font_name_bytes, bold, size)
+        suffix = _RTF_OUTLINE_SUFFIX
+    return prefix, suffix
+
+
+def _build_text_element_proto() -> ET.Element:
+    """Build the RVTextElement skeleton cloned by create_text_element"""
+    text_elem = ET.Element('RVTextElement', _TEXT_ELEMENT_ATTRS)
+    
+    # Position
+    ET.SubElement(text_elem, 'RVRect3D', {'rvXMLIvarName': 'position'})
+    
+    # Shadow and stroke
+    text_elem.append(copy.deepcopy(_TEXT_SHADOW_PROTO))
+    text_elem.append(copy.deepcopy(_TEXT_STROKE_PROTO))
+    
+    # Only RTF Data
+    ET.SubElement(text_elem, 'NSString', {'rvXMLIvarName': 'RTFData'})
+    
+    return text_elem
 
-\f0""" + (r"\b" if font_bold else "") + r"\fs" + str(font_size) + r""" \cf2 \kerning1\expnd8\expndtw40
-\outl0\strokewidth-40 \strokec3 """ + rtf_text + r"""
-}"""
-    rtf_b64 = base64.b64encode(rtf_template.encode('utf-8')).decode('ascii')
-    return rtf_b64
+
+# Complete text element with empty slots (UUID, alignment, position, RTF data);
+# cloning it is several times faster than rebuilding the subtree per slide
+_TEXT_ELEMENT_PROTO = _build_text_element_proto()
 
 
 def create_text_element(text: str, slide_uuid: str, element_uuid: str, position: str = None, 
@@ -75,156 +306,45 @@ def create_text_element(text: str, slide_uuid: str, element_uuid: str, position:
     """Create an RVTextElement with properly encoded text"""
     rtf_encoded = encode_text(text, font_size, font_bold, font_name, simple_format, text_color)
     
-    text_elem = ET.Element('RVTextElement', {
-        'UUID': element_uuid,
-        'additionalLineFillHeight': '0.000000',
-        'adjustsHeightToFit': 'false',
-        'bezelRadius': '0.000000',
-        'displayDelay': '0.000000',
-        'displayName': 'TextElement',
-        'drawLineBackground': 'false',
-        'drawingFill': 'false',
-        'drawingShadow': 'false',
-        'drawingStroke': 'false',
-        'fillColor': '1 1 1 1',
-        'fromTemplate': 'false',
-        'lineBackgroundType': '0',
-        'lineFillVerticalOffset': '0.000000',
-        'locked': 'false',
-        'opacity': '1.000000',
-        'persistent': 'false',
-        'revealType': '0',
-        'rotation': '0.000000',
-        'source': '',
-        'textSourceRemoveLineReturnsOption': 'false',
-        'typeID': '0',
-        'useAllCaps': 'false',
-        'verticalAlignment': vertical_alignment
-    })
+    text_elem = copy.deepcopy(_TEXT_ELEMENT_PROTO)
+    text_elem.set('UUID', element_uuid)
+    text_elem.set('verticalAlignment', vertical_alignment)
+    position_elem, _, _, rtf_data = text_elem
     
     # Position - centered text area by default
-    position_elem = ET.SubElement(text_elem, 'RVRect3D', {'rvXMLIvarName': 'position'})
     if position:
         position_elem.text = position
     else:
         # Default centered position
         position_elem.text = f'{{0 69 0 {default_width} 434}}'
     
-    # Shadow
-    shadow = ET.SubElement(text_elem, 'shadow', {'rvXMLIvarName': 'shadow'})
-    shadow.text = '0.000000|0 0 0 0.3294117748737335|{4, -4}'
-    
-    # Stroke
-    stroke = ET.SubElement(text_elem, 'dictionary', {'rvXMLIvarName': 'stroke'})
-    stroke_color = ET.SubElement(stroke, 'NSColor', {'rvXMLDictionaryKey': 'RVShapeElementStrokeColorKey'})
-    stroke_color.text = '0 0 0 1'
-    stroke_width = ET.SubElement(stroke, 'NSNumber', {
-        'hint': 'double',
-        'rvXMLDictionaryKey': 'RVShapeElementStrokeWidthKey'
-    })
-    stroke_width.text = '0.000000'
-    
     # Only RTF Data
-    rtf_data = ET.SubElement(text_elem, 'NSString', {'rvXMLIvarName': 'RTFData'})
     rtf_data.text = rtf_encoded
     
     return text_elem
 
 
-def create_background_media_cue(media_path: str, cue_uuid: str, element_uuid: str) -> ET.Element:
-    """Create a background media cue for image or video"""
-    # Convert to absolute path with file:// URL format
-    abs_path = os.path.abspath(media_path)
-    file_url = f"file://{abs_path}"
-    
+@lru_cache(maxsize=1024)
+def _resolve_media(abs_path: str) -> Tuple[str, bool, str, str]:
+    """Resolve an absolute media path to (file URL, is video, image format, display name)"""
+    stem, ext = os.path.splitext(os.path.basename(abs_path))
+    ext = ext.lower()
     # Determine if it's an image or video
-    ext = Path(media_path).suffix.lower()
     is_video = ext in ['.mp4', '.mov', '.avi']
-    
-    # Create media cue
-    media_cue = ET.Element('RVMediaCue', {
-        'UUID': cue_uuid,
-        'actionType': '0',
-        'alignment': '4',
-        'behavior': '2',  # 2 for both images and videos
-        'dateAdded': '',
-        'delayTime': '0.000000',
-        'displayName': Path(media_path).stem,
-        'enabled': 'true',
-        'nextCueUUID': '00000000-0000-0000-0000-000000000000',
-        'rvXMLIvarName': 'backgroundMediaCue',
-        'tags': '',
-        'timeStamp': '0.000000'
-    })
+    image_format = 'PNG image' if ext == '.png' else 'JPEG image'
+    return f"file://{abs_path}", is_video, image_format, stem
+
+
+def _build_media_cue_proto(is_video: bool) -> ET.Element:
+    """Build the RVMediaCue skeleton cloned by create_background_media_cue"""
+    media_cue = ET.Element('RVMediaCue', _MEDIA_CUE_ATTRS)
     
     if is_video:
         # Create video element with proper attributes
-        video_elem = ET.SubElement(media_cue, 'RVVideoElement', {
-            'UUID': element_uuid,
-            'audioVolume': '1.000000',
-            'bezelRadius': '0.000000',
-            'displayDelay': '0.000000',
-            'displayName': 'VideoElement',
-            'drawingFill': 'false',
-            'drawingShadow': 'false',
-            'drawingStroke': 'false',
-            'endPoint': '30030',  # Default endpoint
-            'fieldType': '0',
-            'fillColor': '0 0 0 0',
-            'flippedHorizontally': 'false',
-            'flippedVertically': 'false',
-            'format': "'avc1'",
-            'frameRate': '29.970030',
-            'fromTemplate': 'false',
-            'imageOffset': '{0, 0}',
-            'inPoint': '0',
-            'locked': 'false',
-            'manufactureName': '',
-            'manufactureURL': '',
-            'naturalSize': '{1920, 1080}',  # Default HD size
-            'opacity': '1.000000',
-            'outPoint': '30030',
-            'persistent': 'false',
-            'playRate': '1.000000',
-            'playbackBehavior': '1',
-            'rotation': '0.000000',
-            'rvXMLIvarName': 'element',
-            'scaleBehavior': '0',
-            'scaleSize': '{1, 1}',
-            'source': file_url,
-            'timeScale': '1000',
-            'typeID': '0'
-        })
-        element = video_elem
+        element = ET.SubElement(media_cue, 'RVVideoElement', _VIDEO_ELEMENT_ATTRS)
     else:
         # Create image element
-        image_elem = ET.SubElement(media_cue, 'RVImageElement', {
-            'UUID': element_uuid,
-            'bezelRadius': '0.000000',
-            'displayDelay': '0.000000',
-            'displayName': 'ImageElement',
-            'drawingFill': 'false',
-            'drawingShadow': 'false',
-            'drawingStroke': 'false',
-            'fillColor': '0 0 0 0',
-            'flippedHorizontally': 'false',
-            'flippedVertically': 'false',
-            'format': 'PNG image' if ext == '.png' else 'JPEG image',
-            'fromTemplate': 'false',
-            'imageOffset': '{0, 0}',
-            'locked': 'false',
-            'manufactureName': '',
-            'manufactureURL': '',
-            'opacity': '1.000000',
-            'persistent': 'false',
-            'rotation': '0.000000',
-            'rvXMLIvarName': 'element',
-            'scaleBehavior': '0',
-            'scaleSize': '{1, 1}',
-            'source': file_url,
-            'typeID': '0'
-        })
-        element = image_elem
+        element = ET.SubElement(media_cue, 'RVImageElement', _IMAGE_ELEMENT_ATTRS)
     
     # Position
     position = ET.SubElement(element, 'RVRect3D', {'rvXMLIvarName': 'position'})
@@ -233,19 +353,34 @@ def create_background_media_cue(media_path: str, cue_uuid: str, element_uuid: st
     else:
         position.text = '{0 0 0 0 0}'  # Default for images
     
-    # Shadow
-    shadow = ET.SubElement(element, 'shadow', {'rvXMLIvarName': 'shadow'})
-    shadow.text = '0.000000|0 0 0 0.3333333432674408|{4, -4}'
+    # Shadow and stroke
+    element.append(copy.deepcopy(_MEDIA_SHADOW_PROTO))
+    element.append(copy.deepcopy(_MEDIA_STROKE_PROTO))
     
-    # Stroke
-    stroke = ET.SubElement(element, 'dictionary', {'rvXMLIvarName': 'stroke'})
-    stroke_color = ET.SubElement(stroke, 'NSColor', {'rvXMLDictionaryKey': 'RVShapeElementStrokeColorKey'})
-    stroke_color.text = '0 0 0 1'
-    stroke_width = ET.SubElement(stroke, 'NSNumber', {
-        'hint': 'float',
-        'rvXMLDictionaryKey': 'RVShapeElementStrokeWidthKey'
-    })
-    stroke_width.text = '1.000000'
+    return media_cue
+
+
+# Complete media cues with empty per-file slots, cloned for each background
+_VIDEO_CUE_PROTO = _build_media_cue_proto(True)
+_IMAGE_CUE_PROTO = _build_media_cue_proto(False)
+
+
+def create_background_media_cue(media_path: str, cue_uuid: str, element_uuid: str) -> ET.Element:
+    """Create a background media cue for image or video"""
+    # Convert to absolute path with file:// URL format; the cache is keyed on
+    # the absolute path so relative paths stay correct if the cwd changes
+    file_url, is_video, image_format, display_name = _resolve_media(os.path.abspath(media_path))
+    
+    # Create media cue
+    media_cue = copy.deepcopy(_VIDEO_CUE_PROTO if is_video else _IMAGE_CUE_PROTO)
+    media_cue.set('UUID', cue_uuid)
+    media_cue.set('displayName', display_name)
+    
+    element = media_cue[0]
+    element.set('UUID', element_uuid)
+    if not is_video:
+        element.set('format', image_format)
+    element.set('source', file_url)
     
     return media_cue
 
@@ -284,30 +419,35 @@ def create_clear_cue(cue_uuid: str) -> ET.Element:
     return clear_cue
 
 
+def create_ns_string(value: str) -> ET.Element:
+    """Create a bare NSString element holding a single value"""
+    ns_string = ET.Element('NSString')
+    ns_string.text = value
+    return ns_string
+
+
 def create_slide(slide_uuid: str, text: str = None, background_image: str = None, 
-                label: str = "", element_uuid_gen=None, width: int = 1024) -> ET.Element:
-    """Create a slide with optional text content and background image"""
-    slide = ET.Element('RVDisplaySlide', {
-        'UUID': slide_uuid,
-        'backgroundColor': '0 0 0 1',
-        'chordChartPath': '',
-        'drawingBackgroundColor': 'false',
-        'enabled': 'true',
-        'highlightColor': '1 1 1 0',
-        'hotKey': '',
-        'label': label,
-        'notes': '',
-        'socialItemCount': '1' if text else '0'
-    })
+                label: str = "", element_uuid_gen=None, width: int = 1024,
+                background_verified: bool = False) -> ET.Element:
+    """Create a slide with optional text content and background image
+    
+    Pass background_verified=True when background_image is already known
+    to exist (e.g. it came from a directory scan) to skip the existence check.
+    """
+    attrs = _SLIDE_ATTRS.copy()
+    attrs['UUID'] = slide_uuid
+    attrs['label'] = label
+    attrs['socialItemCount'] = '1' if text else '0'
+    slide = ET.Element('RVDisplaySlide', attrs)
     
+    # Children are appended in document order: cues, background, display elements
     # Empty cues array
     cues = ET.SubElement(slide, 'array', {'rvXMLIvarName': 'cues'})
     
     # Add background media if provided
-    if background_image and os.path.exists(background_image):
-        if element_uuid_gen:
-            bg_cue = create_background_media_cue(background_image, element_uuid_gen(), element_uuid_gen())
-            slide.insert(1, bg_cue)  # Insert after cues array
+    if background_image and element_uuid_gen and (background_verified or os.path.exists(background_image)):
+        bg_cue = create_background_media_cue(background_image, element_uuid_gen(), element_uuid_gen())
+        slide.append(bg_cue)
     
     # Display elements array with text
     display_elements = ET.SubElement(slide, 'array', {'rvXMLIvarName': 'displayElements'})
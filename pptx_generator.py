@@ -13,6 +13,7 @@ from pptx.oxml.ns import qn
 from lxml import etree
 import os
 import math
+from operator import attrgetter
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional
 import json
@@ -22,6 +23,10 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+# Image extensions for the legacy directory layout, matched case-sensitively
+# like the Path.glob patterns they replace
+_IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+
 
 class PPTXGenerator:
     def __init__(self, width=1024, height=768, song_background: bool = True):
@@ -273,7 +278,7 @@ class PPTXGenerator:
         source_path = Path(source_dir)
         
         # Collect all files
-        json_files = sorted(source_path.glob('*.json'), key=lambda x: x.name)
+        json_files = sorted(source_path.glob('*.json'), key=attrgetter('name'))
         image_files = []
         video_files = []
         
@@ -285,7 +290,7 @@ class PPTXGenerator:
         video_files.extend(source_path.glob('*.mp4'))
         
         # Combine all media files
-        all_media_files = sorted(image_files + video_files, key=lambda x: x.name)
+        all_media_files = sorted(image_files + video_files, key=attrgetter('name'))
         
         # Create a set of all unique base names
         all_base_names = set()
@@ -361,24 +366,17 @@ class PPTXGenerator:
         """Generate PowerPoint from directory using unified rules."""
         source_path = Path(source_dir)
         
-        # Check if directory has JSON files
-        json_files = list(source_path.glob('*.json'))
+        # Read the directory once and dispatch names by extension
+        names = sorted(os.listdir(source_path))
         
-        if json_files:
+        # Check if directory has JSON files
+        if any(name.endswith('.json') for name in names):
             # Use unified JSON/media processing
             return self.generate_from_json_directory(source_dir)
         
-        # Legacy processing - check for song files
-        text_files = list(source_path.glob('*.txt'))
-        image_files = []
-        
-        # Collect image files
-        for ext in ['*.png', '*.jpg', '*.jpeg']:
-            image_files.extend(source_path.glob(ext))
-        
-        # Sort files
-        text_files.sort(key=lambda x: x.name)
-        image_files.sort(key=lambda x: x.name)
+        # Legacy processing - check for song files (names are already sorted)
+        text_files = [source_path / name for name in names if name.endswith('.txt')]
+        image_files = [source_path / name for name in names if name.endswith(_IMAGE_EXTENSIONS)]
         
         # Check if any text file is a song
         song_file = None